@@ -11,11 +11,30 @@ import sys
 import json
 import re
 import argparse
+import hashlib
+import threading
 import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional
-import colorsys
+from typing import Dict, Iterator, List, Match, Set, Tuple, Any, Optional
+
+try:
+    import hyperscan
+except ImportError:  # Colors are matched with re only
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:  # Reports are generated with json
+    orjson = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Watch mode falls back to polling
+    Observer = None
 
 # Regular expressions for different color formats
 HEX_COLOR_REGEX = r'#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})\b'
@@ -68,7 +87,128 @@ NAMED_COLORS = {
     'whitesmoke': '#f5f5f5', 'yellow': '#ffff00', 'yellowgreen': '#9acd32'
 }
 
-NAMED_COLOR_REGEX = '|'.join(r'\b' + color + r'\b' for color in NAMED_COLORS.keys())
+
+def _trie_regex(words) -> str:
+    """
+    Build a regex alternation of words that shares common prefixes,
+    so the engine tests each leading character only once.
+
+    Examples:
+    - dimgray, dimgrey -> dimgr(?:ay|ey)
+    - gold, goldenrod -> gold(?:enrod)?
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of word marker
+
+    def to_regex(node: dict) -> str:
+        branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if '' in node else group
+
+    return to_regex(trie)
+
+
+NAMED_COLOR_REGEX = r'\b(?:' + _trie_regex(NAMED_COLORS) + r')\b'
+
+# All color formats combined into one pattern. Each alternative is wrapped in a
+# named group; its own capture groups follow it. COLOR_RE is matched at the
+# positions where Hyperscan finds colors; without Hyperscan, content is scanned
+# for hex colors and then once with NON_HEX_COLOR_RE or NAMED_COLOR_RE.
+COLOR_FORMAT_REGEXES = (
+    ('hex', HEX_COLOR_REGEX),
+    ('rgba', RGBA_COLOR_REGEX),
+    ('rgb', RGB_COLOR_REGEX),
+    ('hsla', HSLA_COLOR_REGEX),
+    ('hsl', HSL_COLOR_REGEX),
+    ('named', f'(?i:{NAMED_COLOR_REGEX})'),
+)
+COLOR_RE = re.compile('|'.join(f'(?P<{name}>{regex})' for name, regex in COLOR_FORMAT_REGEXES))
+
+# The same without hex colors, which _scan_hex_colors finds without a regex
+NON_HEX_COLOR_RE = re.compile('|'.join(f'(?P<{name}>{regex})' for name, regex in COLOR_FORMAT_REGEXES
+                                       if name != 'hex'))
+
+# Named colors alone, used for content that cannot contain any other format
+NAMED_COLOR_RE = re.compile(f'(?P<named>(?i:{NAMED_COLOR_REGEX}))')
+
+# Every rgb(a) and hsl(a) color contains one of these
+COLOR_SIGNATURES = ('rgb', 'hsl')
+
+# Characters allowed in hex colors
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+
+def _compile_hyperscan_database():
+    """
+    Compile the color patterns into a Hyperscan database.
+
+    Hyperscan only reports where matches start; COLOR_RE is then matched at
+    those positions to get the groups. re treats \x1c-\x1f as whitespace in
+    str patterns, so \s is widened to match the same characters.
+
+    Returns None if this build of Hyperscan cannot compile the patterns, in
+    which case colors are matched with re.
+    """
+    patterns = [HEX_COLOR_REGEX, RGBA_COLOR_REGEX, RGB_COLOR_REGEX,
+                HSLA_COLOR_REGEX, HSL_COLOR_REGEX, NAMED_COLOR_REGEX]
+    flags = [hyperscan.HS_FLAG_SOM_LEFTMOST] * len(patterns)
+    flags[-1] |= hyperscan.HS_FLAG_CASELESS  # Named colors
+
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[pattern.replace(r'\s', r'[\s\x1c-\x1f]').encode('ascii') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=flags,
+        )
+    except hyperscan.error as e:
+        print(f"Warning: Could not compile Hyperscan database, using re instead: {e}", file=sys.stderr)
+        return None
+    return database
+
+
+# Optional Hyperscan database used instead of COLOR_RE to find colors in ASCII content
+HYPERSCAN_DATABASE = _compile_hyperscan_database() if hyperscan is not None else None
+
+# Files are read in chunks of this many characters. The overlap between chunks
+# must be longer than any hex or named color. rgb() and hsl() colors can be
+# longer, so when one is still open at the end of a chunk it is kept whole.
+READ_CHUNK_SIZE = 1 << 16
+CHUNK_OVERLAP = 256
+
+# What can follow the '(' of an rgb(), rgba(), hsl() or hsla() color that is not closed yet
+_OPEN_COLOR_ARGS_RE = re.compile(r'[\s\d,%.]*')
+
+# Minimum number of files for which process_files uses worker processes
+PARALLEL_MIN_FILES = 8
+
+# Per-file results are cached between runs, in one file in CACHE_DIR for each
+# set of analyzed paths (see cache_path_for). Bump CACHE_VERSION whenever
+# extraction changes, so results from older versions are not reused. Cache
+# files not used for CACHE_MAX_AGE seconds are removed (see remove_old_caches).
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'css-colors-analyzer')
+CACHE_VERSION = 1
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# Two digit lowercase hex for every channel value, to build colors without formatting
+_HEX2 = tuple(f'{i:02x}' for i in range(256))
+
+# 3-digit hex colors expanded to 6 digits, filled in as they are seen
+_EXPANDED_SHORT_HEX: Dict[str, str] = {}
+
+# Normalized value and variation for each matched color text, up to
+# PARSED_COLORS_CACHE_SIZE entries before the cache is cleared
+PARSED_COLORS_CACHE_SIZE = 1 << 16
+_PARSED_COLORS: Dict[str, Tuple[str, str]] = {}
 
 
 def normalize_hex_color(hex_color: str) -> str:
@@ -82,33 +222,61 @@ def normalize_hex_color(hex_color: str) -> str:
     """
     hex_color = hex_color.lower()
     if len(hex_color) == 4:  # Convert 3-digit hex to 6-digit
-        return '#' + ''.join(c + c for c in hex_color[1:])
+        expanded = _EXPANDED_SHORT_HEX.get(hex_color)
+        if expanded is None:
+            expanded = '#' + hex_color[1] * 2 + hex_color[2] * 2 + hex_color[3] * 2
+            _EXPANDED_SHORT_HEX[hex_color] = expanded
+        return expanded
     return hex_color
 
 
 def hex_to_rgb(hex_color: str) -> tuple:
     """Convert hex color to RGB tuple."""
-    hex_color = normalize_hex_color(hex_color)[1:]  # Remove the #
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    return tuple(bytes.fromhex(normalize_hex_color(hex_color)[1:]))  # Without the #
 
 
 def rgb_to_hsl(r: int, g: int, b: int) -> tuple:
-    """Convert RGB to HSL."""
+    """
+    Convert RGB to HSL.
+
+    Same arithmetic as colorsys.rgb_to_hls, inlined so the results match it
+    exactly, computing only the hue terms for the channel that is largest.
+    """
     r, g, b = r / 255.0, g / 255.0, b / 255.0
-    h, l, s = colorsys.rgb_to_hls(r, g, b)
+    maxc = max(r, g, b)
+    minc = min(r, g, b)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    if minc == maxc:
+        return (0, 0, int(l * 100))
+
+    if l <= 0.5:
+        s = rangec / sumc
+    else:
+        s = rangec / (2.0 - maxc - minc)
+
+    if r == maxc:
+        h = (maxc - b) / rangec - (maxc - g) / rangec
+    elif g == maxc:
+        h = 2.0 + (maxc - r) / rangec - (maxc - b) / rangec
+    else:
+        h = 4.0 + (maxc - g) / rangec - (maxc - r) / rangec
+    h = (h / 6.0) % 1.0
     return (int(h * 360), int(s * 100), int(l * 100))
 
 
+@lru_cache(maxsize=4096)
 def determine_color_category(hex_color: str) -> str:
     """
     Determine the color category based on the hex color.
     Categories: red, orange, yellow, green, teal, blue, purple, pink, gray, brown, black, white
     """
-    rgb = hex_to_rgb(hex_color)
-    hsl = rgb_to_hsl(*rgb)
+    return _category_from_hsl(*rgb_to_hsl(*hex_to_rgb(hex_color)))
 
-    h, s, l = hsl
 
+def _category_from_hsl(h: int, s: int, l: int) -> str:
+    """Map HSL values (as returned by rgb_to_hsl) to a color category."""
     # Handle grayscale colors
     if s < 10:
         if l < 10:
@@ -137,6 +305,10 @@ def determine_color_category(hex_color: str) -> str:
         return "pink"
 
 
+# Format reported for a color that appears in several formats in the same file
+FORMAT_PRECEDENCE = ('hex', 'rgb', 'rgba', 'hsl', 'hsla', 'named')
+
+
 def format_of_color(color: str) -> str:
     """Determine the format of a color string."""
     if color.startswith('#'):
@@ -153,208 +325,426 @@ def format_of_color(color: str) -> str:
         return 'named'
 
 
-# Fix the extract_colors_from_content function:
-def extract_colors_from_content(content: str) -> Dict[str, List[str]]:
-    """Extract all colors from content and return them organized by normalized value."""
-    color_matches = {}
+def _parse_hex_match(match) -> Tuple[str, str]:
+    color = match.group(0).lower()
+    return normalize_hex_color(color), color
 
-    # Extract hex colors
-    for match in re.finditer(HEX_COLOR_REGEX, content):
-        try:
-            color = match.group(0).lower()
-            normalized = normalize_hex_color(color)
 
-            if normalized not in color_matches:
-                color_matches[normalized] = []
+def _parse_rgb_match(match) -> Tuple[str, str]:
+    r, g, b = match.groups()[match.lastindex:match.lastindex + 3]
+    return '#' + _HEX2[min(int(r), 255)] + _HEX2[min(int(g), 255)] + _HEX2[min(int(b), 255)], match.group(0)
 
-            if color not in color_matches[normalized]:
-                color_matches[normalized].append(color)
-        except Exception as e:
-            print(f"Warning: Could not parse hex color {match.group(0)}: {e}")
-            continue
 
-    # Extract RGB colors
-    for match in re.finditer(RGB_COLOR_REGEX, content):
-        try:
-            color = match.group(0)
-            groups = match.groups()
-            r, g, b = int(groups[0]), int(groups[1]), int(groups[2])
-            hex_value = f'#{r:02x}{g:02x}{b:02x}'
-
-            if hex_value not in color_matches:
-                color_matches[hex_value] = []
-
-            if color not in color_matches[hex_value]:
-                color_matches[hex_value].append(color)
-        except Exception as e:
-            print(f"Warning: Could not parse RGB color {match.group(0)}: {e}")
-            continue
+def _hsl_to_hex(h: int, s: int, l: int) -> str:
+    """
+    Convert HSL (degrees, percent, percent) to a hex color.
 
-    # Extract RGBA colors
-    for match in re.finditer(RGBA_COLOR_REGEX, content):
-        try:
-            color = match.group(0)
-            groups = match.groups()
-            # Make sure we only take the first 4 values if more are captured
-            r, g, b, a = groups[0], groups[1], groups[2], groups[3]
-            hex_value = f'#{int(r):02x}{int(g):02x}{int(b):02x}'
-            
-            if hex_value not in color_matches:
-                color_matches[hex_value] = []
-            
-            if color not in color_matches[hex_value]:
-                color_matches[hex_value].append(color)
-        except Exception as e:
-            print(f"Warning: Could not parse RGBA color {match.group(0)}: {e}")
-            continue
+    Uses the chroma/sector form of the conversion instead of colorsys.hls_to_rgb.
+    Saturation and lightness are clamped to 100% as CSS does.
+    """
+    h = h / 360.0
+    s = min(s, 100) / 100.0
+    l = min(l, 100) / 100.0
+    c = (1 - abs(2 * l - 1)) * s
+    x = c * (1 - abs((h * 6) % 2 - 1))
+    m = l - c / 2
+    r, g, b = ((c, x, 0), (x, c, 0), (0, c, x), (0, x, c), (x, 0, c), (c, 0, x))[int(h * 6) % 6]
+    return '#' + _HEX2[int((r + m) * 255)] + _HEX2[int((g + m) * 255)] + _HEX2[int((b + m) * 255)]
+
+
+def _parse_hsl_match(match) -> Tuple[str, str]:
+    h, s, l = match.groups()[match.lastindex:match.lastindex + 3]
+    return _hsl_to_hex(int(h), int(s), int(l)), match.group(0)
+
+
+def _parse_named_match(match) -> Tuple[str, str]:
+    color = match.group(0).lower()
+    return NAMED_COLORS.get(color), color
+
+
+# Parser and label (used in warnings) for each alternative of COLOR_RE
+COLOR_PARSERS = {
+    'hex': (_parse_hex_match, 'hex'),
+    'rgba': (_parse_rgb_match, 'RGBA'),
+    'rgb': (_parse_rgb_match, 'RGB'),
+    'hsla': (_parse_hsl_match, 'HSLA'),
+    'hsl': (_parse_hsl_match, 'HSL'),
+    'named': (_parse_named_match, 'named'),
+}
 
-    # Extract HSL colors
-    for match in re.finditer(HSL_COLOR_REGEX, content):
-        try:
-            color = match.group(0)
-            groups = match.groups()
-            h, s, l = int(groups[0]), int(groups[1]), int(groups[2])
-            h = h / 360.0
-            s = s / 100.0
-            l = l / 100.0
-
-            r, g, b = colorsys.hls_to_rgb(h, l, s)
-            r, g, b = int(r * 255), int(g * 255), int(b * 255)
-            hex_value = f'#{r:02x}{g:02x}{b:02x}'
-
-            if hex_value not in color_matches:
-                color_matches[hex_value] = []
-
-            if color not in color_matches[hex_value]:
-                color_matches[hex_value].append(color)
-        except Exception as e:
-            print(f"Warning: Could not parse HSL color {match.group(0)}: {e}")
-            continue
 
-    # Extract HSLA colors
-    for match in re.finditer(HSLA_COLOR_REGEX, content):
-        try:
-            color = match.group(0)
-            groups = match.groups()
-            h, s, l, a = groups[0], groups[1], groups[2], groups[3]
-            h = int(h) / 360.0
-            s = int(s) / 100.0
-            l = int(l) / 100.0
-
-            r, g, b = colorsys.hls_to_rgb(h, l, s)
-            r, g, b = int(r * 255), int(g * 255), int(b * 255)
-            hex_value = f'#{r:02x}{g:02x}{b:02x}'
-
-            if hex_value not in color_matches:
-                color_matches[hex_value] = []
-
-            if color not in color_matches[hex_value]:
-                color_matches[hex_value].append(color)
-        except Exception as e:
-            print(f"Warning: Could not parse HSLA color {match.group(0)}: {e}")
-            continue
+def _hyperscan_finditer(content: str, data: bytes, pos: int = 0) -> Iterator[Match]:
+    """
+    Same as COLOR_RE.finditer(content, pos) for ASCII content, but with Hyperscan
+    finding where the matches start in data, the content encoded as ASCII.
+    """
+    starts = []
+
+    def on_match(pattern_id, start, end, flags, context):
+        starts.append(start)
+
+    HYPERSCAN_DATABASE.scan(data, match_event_handler=on_match)
+
+    # Like finditer, skip matches that overlap the previous one
+    end = pos
+    for start in sorted(starts):
+        if start >= end:
+            match = COLOR_RE.match(content, start)
+            if match is not None:
+                end = match.end()
+                yield match
 
-    # Extract named colors
-    for match in re.finditer(NAMED_COLOR_REGEX, content, re.IGNORECASE):
+
+def _scan_hex_colors(content: str, color_matches: Dict[str, Set[str]], pos: int, limit: int) -> int:
+    """
+    Add the hex colors found in content, starting at pos, to color_matches.
+
+    Finds the same colors as HEX_COLOR_REGEX by jumping from one '#' to the
+    next with str.find, rather than having the regex engine try the pattern
+    at every position. Handles limit and returns like _scan_colors.
+    """
+    length = len(content)
+    start = content.find('#', pos)
+    while start != -1:
+        end = start + 1
+        digits_end = min(start + 7, length)
+        while end < digits_end and content[end] in _HEX_DIGITS:
+            end += 1
+
+        # Like \b, the digits must not be followed by another word character
+        digits = end - start - 1
+        if (digits == 3 or digits == 6) and (end == length or not (content[end].isalnum() or content[end] == '_')):
+            if end > limit:
+                return max(pos, min(start, limit))
+            color = content[start:end].lower()
+            color_matches[normalize_hex_color(color)].add(color)
+
+        start = content.find('#', end)
+
+    return max(pos, limit)
+
+
+def _scan_colors(content: str, color_matches: Dict[str, Set[str]], pos: int = 0,
+                 limit: Optional[int] = None) -> int:
+    """
+    Add the colors found in content, starting at pos, to color_matches.
+
+    Matches that end after limit are left alone, since more content could
+    still change them. Returns the position scanning should resume from.
+    """
+    if limit is None:
+        limit = len(content)
+    resume = max(pos, limit)
+
+    data = None
+    if HYPERSCAN_DATABASE is not None:
         try:
-            color = match.group(0).lower()
-            hex_value = NAMED_COLORS.get(color)
+            data = content.encode('ascii')
+        except UnicodeEncodeError:
+            pass  # Byte offsets would not match string offsets, so re is used instead
 
-            if hex_value not in color_matches:
-                color_matches[hex_value] = []
+    if data is not None:
+        matches = _hyperscan_finditer(content, data, pos)
+    else:
+        resume = _scan_hex_colors(content, color_matches, pos, limit)
+        # Most code has no rgb or hsl colors at all, and looking for named
+        # colors alone is much cheaper than matching the combined pattern
+        if any(signature in content for signature in COLOR_SIGNATURES):
+            matches = NON_HEX_COLOR_RE.finditer(content, pos)
+        else:
+            matches = NAMED_COLOR_RE.finditer(content, pos)
+
+    # The named group that matched tells the format
+    for match in matches:
+        if match.end() > limit:
+            return max(pos, min(match.start(), resume))
+
+        # The same color is usually written the same way many times, so
+        # each distinct match is only converted once
+        text = match.group(0)
+        parsed = _PARSED_COLORS.get(text)
+        if parsed is None:
+            parse, label = COLOR_PARSERS[match.lastgroup]
+            try:
+                parsed = parse(match)
+            except Exception as e:
+                print(f"Warning: Could not parse {label} color {text}: {e}")
+                continue
+            if len(_PARSED_COLORS) >= PARSED_COLORS_CACHE_SIZE:
+                _PARSED_COLORS.clear()
+            _PARSED_COLORS[text] = parsed
+
+        normalized, color = parsed
+        color_matches[normalized].add(color)
+
+    return resume
+
+
+def _open_color_start(content: str, pos: int = 0) -> int:
+    """
+    Return where an rgb(), rgba(), hsl() or hsla() color that is still open at
+    the end of content starts, or len(content) if there is none after pos.
+    """
+    # The arguments of a color contain no '(', so an open color uses the last one
+    paren = content.rfind('(', pos)
+    if paren != -1 and _OPEN_COLOR_ARGS_RE.fullmatch(content, paren + 1):
+        for function in ('rgba', 'hsla', 'rgb', 'hsl'):
+            start = paren - len(function)
+            if start >= pos and content.startswith(function, start):
+                return start
+    return len(content)
 
-            if color not in color_matches[hex_value]:
-                color_matches[hex_value].append(color)
-        except Exception as e:
-            print(f"Warning: Could not parse named color {match.group(0)}: {e}")
-            continue
 
-    return color_matches
+def extract_colors_from_content(content: str) -> Dict[str, Set[str]]:
+    """Extract all colors from content and return them organized by normalized value."""
+    color_matches = defaultdict(set)
+    _scan_colors(content, color_matches)
+    return dict(color_matches)
 
 
-def analyze_file(file_path: Path) -> Dict[str, List[str]]:
+def analyze_file(file_path: str) -> Dict[str, Set[str]]:
     """Analyze a single file and extract colors."""
+    file_colors = _try_analyze_file(file_path)
+    return file_colors if file_colors is not None else {}
+
+
+def _try_analyze_file(file_path: str) -> Optional[Dict[str, Set[str]]]:
+    """
+    Same as analyze_file, but returns None if the file could not be analyzed.
+
+    The file is read in chunks of READ_CHUNK_SIZE characters. The last
+    CHUNK_OVERLAP characters of each chunk are scanned again together with
+    the next one, so colors split between two chunks are still found.
+    """
+    color_matches = defaultdict(set)
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        return extract_colors_from_content(content)
+            tail, start = '', 0
+            for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), ''):
+                buffer = tail + chunk
+                resume = _scan_colors(buffer, color_matches, start, len(buffer) - CHUNK_OVERLAP)
+                resume = min(resume, _open_color_start(buffer, start))
+                # Keep the character before the resume point for \b checks
+                start = min(resume, 1)
+                tail = buffer[resume - start:]
+            _scan_colors(tail, color_matches, start)
+        return dict(color_matches)
     except Exception as e:
         print(f"Error analyzing {file_path}: {e}", file=sys.stderr)
-        return {}
+        return None
 
 # Then modify find_files to use this argument
-def find_files(path: Path, extensions: Set[str], ignore_dirs: List[str] = None) -> List[Path]:
-    """Find all files with given extensions in a directory tree."""
+def find_files(path: Path, extensions: Set[str], ignore_dirs: List[str] = None) -> List[str]:
+    """
+    Find all files with given extensions in a directory tree.
+
+    Directories are listed with os.scandir, walking them in the same order
+    as os.walk, and file paths are returned as strings.
+    """
     if ignore_dirs is None:
         ignore_dirs = []
-    
+    ignore_dirs = set(ignore_dirs)
+
     if path.is_file():
-        return [path] if path.suffix.lower() in extensions else []
-    
+        return [str(path)] if path.suffix.lower() in extensions else []
+
     files = []
-    for root, dirs, filenames in os.walk(path):
-        # Remove directories to ignore
-        for ignore_dir in ignore_dirs:
-            if ignore_dir in dirs:
-                dirs.remove(ignore_dir)
-        
-        for filename in filenames:
-            file_path = Path(root) / filename
-            if file_path.suffix.lower() in extensions:
-                files.append(file_path)
+    stack = [str(path)]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if is_dir:
+                        # Skip ignored directories and don't follow symlinks, like os.walk
+                        if entry.name not in ignore_dirs and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    else:
+                        dot = entry.name.rfind('.')
+                        if dot > 0 and entry.name[dot:].lower() in extensions:
+                            files.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
     return files
 
 
-def process_files(files: List[Path]) -> Dict[str, Any]:
-    """Process a list of files and aggregate color data."""
+def cache_path_for(paths: List[str]) -> Path:
+    """Return the cache file for analyzing the given input files and directories."""
+    key = '\0'.join(sorted(os.path.abspath(path) for path in paths))
+    return CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def load_cache(cache_path: Path) -> Dict[str, Any]:
+    """Load the per-file results of previous runs, or an empty cache if they are missing, outdated or invalid."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cache_file:
+            cache = json.load(cache_file)
+        if cache.get('version') == CACHE_VERSION and isinstance(cache['files'], dict):
+            return cache['files']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def save_cache(cache: Dict[str, Any], cache_path: Path):
+    """Save per-file results for the next run. Failing to write the cache is only a warning."""
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump({'version': CACHE_VERSION, 'files': cache}, cache_file, default=sorted)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not save cache to {cache_path}: {e}", file=sys.stderr)
+
+
+def remove_old_caches(cache_dir: Path = CACHE_DIR, max_age: float = CACHE_MAX_AGE):
+    """Remove the cache files in cache_dir (see cache_path_for) that were last saved more than max_age seconds ago."""
+    oldest = time.time() - max_age
+    try:
+        cache_files = list(cache_dir.glob('*.json'))
+    except OSError:
+        return
+    for cache_file in cache_files:
+        # Only remove files named like cache_path_for names them
+        if len(cache_file.stem) != 40 or not set(cache_file.stem) <= _HEX_DIGITS:
+            continue
+        try:
+            if cache_file.stat().st_mtime < oldest:
+                cache_file.unlink()
+        except OSError:
+            pass
+
+
+def analyze_files(files: List[str], cache: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Set[str]]]:
+    """
+    Analyze a list of files and return the colors found in each one.
+
+    Files are analyzed in parallel worker processes, unless there are fewer
+    than PARALLEL_MIN_FILES of them and starting the workers would cost more.
+
+    If a cache (see load_cache) is given, files whose size and modification
+    time match their cached entry are not analyzed again, and the results
+    for the other files are added to the cache. Files that could not be
+    analyzed are not cached, and entries for files that are not in the list
+    are removed.
+    """
+    files_colors = {}
+    file_stats = {}
+    to_analyze = files
+
+    if cache is not None:
+        to_analyze = []
+        for file_path in files:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                to_analyze.append(file_path)
+                continue
+
+            file_stats[file_path] = [stat.st_size, stat.st_mtime_ns]
+            entry = cache.get(os.path.abspath(file_path))
+            if (isinstance(entry, dict) and entry.get('stat') == file_stats[file_path]
+                    and isinstance(entry.get('colors'), dict)):
+                files_colors[file_path] = {normalized: set(variations)
+                                           for normalized, variations in entry['colors'].items()}
+            else:
+                to_analyze.append(file_path)
+
+    if len(to_analyze) < PARALLEL_MIN_FILES:
+        results = map(_try_analyze_file, to_analyze)
+    else:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(_try_analyze_file, to_analyze, chunksize=16))
+
+    for file_path, file_colors in zip(to_analyze, results):
+        if file_colors is None:
+            # Not cached, so the file is analyzed again on the next run
+            files_colors[file_path] = {}
+            continue
+        files_colors[file_path] = file_colors
+        if file_path in file_stats:
+            cache[os.path.abspath(file_path)] = {'stat': file_stats[file_path], 'colors': file_colors}
+
+    if cache is not None:
+        # Drop files that were deleted, renamed or are no longer analyzed
+        analyzed = {os.path.abspath(file_path) for file_path in files}
+        for cached_path in [cached_path for cached_path in cache if cached_path not in analyzed]:
+            del cache[cached_path]
+
+    # Keep the order of the files list
+    return {file_path: files_colors[file_path] for file_path in files}
+
+
+def aggregate_colors(files_colors: Dict[str, Dict[str, Set[str]]]) -> Dict[str, Any]:
+    """Aggregate the colors found in each file and organize them by category."""
     color_data = {}
 
-    for file_path in files:
-        file_colors = analyze_file(file_path)
+    for file_path, file_colors in files_colors.items():
         file_str = str(file_path)
 
         for normalized_value, variations in file_colors.items():
-            if normalized_value not in color_data:
-                color_format = format_of_color(variations[0])
-                category = determine_color_category(normalized_value)
+            entry = color_data.get(normalized_value)
+            if entry is None:
+                color_format = min((format_of_color(variation) for variation in variations),
+                                   key=FORMAT_PRECEDENCE.index)
 
+                # Variations and locations are sets here and sorted when the report is generated
                 color_data[normalized_value] = {
                     'name': normalized_value,
                     'count': 1,
-                    'variations': variations,
+                    'variations': set(variations),
                     'unique': True,
                     'color_format': color_format,
-                    'category': category,
-                    'locations': [file_str]
+                    'category': determine_color_category(normalized_value),
+                    'locations': {file_str}
                 }
             else:
-                color_data[normalized_value]['count'] += 1
-                for variation in variations:
-                    if variation not in color_data[normalized_value]['variations']:
-                        color_data[normalized_value]['variations'].append(variation)
-                if file_str not in color_data[normalized_value]['locations']:
-                    color_data[normalized_value]['locations'].append(file_str)
-                color_data[normalized_value]['unique'] = False
+                entry['count'] += 1
+                entry['variations'] |= variations
+                entry['locations'].add(file_str)
+                entry['unique'] = False
 
     # Organize colors by category
-    organized_data = {}
-    for color_hex, color_info in color_data.items():
-        category = color_info['category']
-        if category not in organized_data:
-            organized_data[category] = []
-        organized_data[category].append(color_info)
+    organized_data = defaultdict(list)
+    for color_info in color_data.values():
+        organized_data[color_info['category']].append(color_info)
 
-    return organized_data
+    return dict(organized_data)
 
 
-def generate_color_report(color_data: Dict[str, Any], pretty: bool = False) -> str:
-    """Generate a JSON report of color data."""
+def process_files(files: List[str], cache: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Process a list of files and aggregate color data, using cached results if a cache is given."""
+    return aggregate_colors(analyze_files(files, cache))
+
+
+def generate_color_report(color_data: Dict[str, Any], pretty: bool = False) -> bytes:
+    """
+    Generate a JSON report of color data as UTF-8 bytes. Sets are written as sorted lists.
+
+    orjson is used when it is installed, since it is much faster on large reports.
+    """
+    if orjson is not None:
+        return orjson.dumps(color_data, default=sorted, option=orjson.OPT_INDENT_2 if pretty else 0)
     indent = 2 if pretty else None
-    return json.dumps(color_data, indent=indent)
+    return json.dumps(color_data, indent=indent, default=sorted).encode('utf-8')
 
 
-def watch_files(files: List[Path], output_path: Optional[str], pretty: bool = False):
-    """Watch files for changes and update the analysis."""
+def _print_report(report: bytes):
+    """Write a report from generate_color_report to stdout as is, without decoding it."""
+    sys.stdout.flush()  # Anything already printed comes first
+    sys.stdout.buffer.write(report + b'\n')
+    sys.stdout.buffer.flush()
+
+
+def _poll_changes(files: List[str]) -> Iterator[Set[str]]:
+    """Check the modification times of files every second and yield the ones that changed."""
     last_modification_times = {}
 
     for file_path in files:
@@ -364,31 +754,93 @@ def watch_files(files: List[Path], output_path: Optional[str], pretty: bool = Fa
             last_modification_times[file_path] = 0
 
     while True:
-        files_changed = False
+        changed_files = set()
 
         for file_path in files:
             try:
                 mtime = os.path.getmtime(file_path)
                 if mtime > last_modification_times.get(file_path, 0):
-                    files_changed = True
+                    changed_files.add(file_path)
                     last_modification_times[file_path] = mtime
             except Exception:
                 pass
 
-        if files_changed:
-            color_data = process_files(files)
-            report = generate_color_report(color_data, pretty)
-
-            if output_path:
-                with open(output_path, 'w', encoding='utf-8') as out_file:
-                    out_file.write(report)
-                print(f"Updated color analysis to {output_path}")
-            else:
-                print(report)
+        if changed_files:
+            yield changed_files
 
         time.sleep(1)
 
 
+def _watch_events(files: List[str]) -> Iterator[Set[str]]:
+    """Wait for watchdog file system events and yield the watched files that changed."""
+    watched = {os.path.abspath(file_path): file_path for file_path in files}
+    changed_files = set()
+    condition = threading.Condition()
+
+    class ChangeHandler(FileSystemEventHandler):
+        def _changed(self, path: str):
+            file_path = watched.get(os.path.abspath(path))
+            if file_path is not None:
+                with condition:
+                    changed_files.add(file_path)
+                    condition.notify()
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                self._changed(event.src_path)
+
+        def on_created(self, event):
+            if not event.is_directory:
+                self._changed(event.src_path)
+
+        def on_moved(self, event):
+            # Editors often save by writing a temporary file and renaming it
+            if not event.is_directory:
+                self._changed(event.dest_path)
+
+    observer = Observer()
+    handler = ChangeHandler()
+    for directory in {os.path.dirname(path) for path in watched}:
+        observer.schedule(handler, directory, recursive=False)
+    observer.start()
+
+    try:
+        while True:
+            with condition:
+                condition.wait_for(lambda: changed_files)
+                batch = set(changed_files)
+                changed_files.clear()
+            yield batch
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def watch_files(files: List[str], output_path: Optional[str], pretty: bool = False):
+    """
+    Watch files for changes and update the analysis.
+
+    Only the files that changed are analyzed again. Changes are reported by
+    watchdog when it is installed; otherwise files are polled every second.
+    """
+    files_colors = analyze_files(files)
+    changes = _watch_events(files) if Observer is not None else _poll_changes(files)
+
+    for changed_files in changes:
+        for file_path in changed_files:
+            files_colors[file_path] = analyze_file(file_path)
+
+        color_data = aggregate_colors(files_colors)
+        report = generate_color_report(color_data, pretty)
+
+        if output_path:
+            with open(output_path, 'wb') as out_file:
+                out_file.write(report)
+            print(f"Updated color analysis to {output_path}")
+        else:
+            _print_report(report)
+
+
 def main():
     """Main function to run the tool."""
     parser = argparse.ArgumentParser(
@@ -423,6 +875,8 @@ Examples:
     parser.add_argument('-o', '--output', type=str, help='Output file to save the analysis (default: stdout)')
     parser.add_argument('--pretty', action='store_true', help='Format the JSON output to be more readable')
     parser.add_argument('--watch', action='store_true', help='Watch files for changes and update analysis')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Analyze all files again instead of reusing results of previous runs')
 
     args = parser.parse_args()
 
@@ -437,7 +891,7 @@ Examples:
     if args.input:
         input_path = Path(args.input)
         if input_path.is_file():
-            files = [input_path]
+            files = [str(input_path)]
         else:
             print(f"Error: {args.input} is not a file", file=sys.stderr)
             sys.exit(1)
@@ -460,15 +914,20 @@ Examples:
         print(f"Watching {len(files)} files for changes...")
         watch_files(files, args.output, args.pretty)
     else:
-        color_data = process_files(files)
+        cache_path = cache_path_for([path for path in (args.input, args.dir) if path])
+        cache = None if args.no_cache else load_cache(cache_path)
+        color_data = process_files(files, cache)
+        if cache is not None:
+            save_cache(cache, cache_path)
+            remove_old_caches()
         report = generate_color_report(color_data, args.pretty)
 
         if args.output:
-            with open(args.output, 'w', encoding='utf-8') as out_file:
+            with open(args.output, 'wb') as out_file:
                 out_file.write(report)
             print(f"Color analysis saved to {args.output}")
         else:
-            print(report)
+            _print_report(report)
 
 if __name__ == '__main__':
     main()
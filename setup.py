@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name="css-colors-analyzer",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests']),
     setup_requires=["setuptools>=42.0"],  # Add this line
     entry_points={
         'console_scripts': [
@@ -11,6 +11,11 @@ setup(
         ],
     },
     install_requires=["setuptools>=42.0"],  # Add this line too for runtime dependencies
+    extras_require={
+        'watch': ["watchdog"],  # File system events for --watch instead of polling
+        'hyperscan': ["hyperscan"],  # Faster color matching
+        'orjson': ["orjson"],  # Faster JSON reports
+    },
     author="inaki",
     author_email="iiaranzadi@gmail.com",
     description="A tool to analyze colors in CSS and other web files",
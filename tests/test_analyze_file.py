@@ -0,0 +1,48 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from css_colors_analyzer import analyzer
+
+# Pieces of CSS that colors spanning chunk boundaries are built from
+FRAGMENTS = [
+    '#fff', '#a1b2c3', '#abcd', '#fff_', 'rgb(1,2,3)', 'rgb( 10 ,\n 20 , 30 )', 'rgba(1,2,3,.5)',
+    'hsl(120,50%,50%)', 'hsla(120, 50%, 50%, 0.3)', 'rgb(1,2', 'hsl(', 'red', 'Red', 'redish', 'xred',
+    'lightgoldenrodyellow', 'rgb(1,' + ' ' * 80 + '2,3)', 'hsl(' + '0' * 60 + '1,2%,3%)',
+    ' ', '\n', ';', ',', '(', ')', '{', '}', '#', 'a', '0', 'é', 'color: ',
+]
+
+
+class AnalyzeFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'style.css')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_same_as_whole_content(self, content: str):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        self.assertEqual(analyzer.analyze_file(self.path), analyzer.extract_colors_from_content(content))
+
+    def test_color_longer_than_chunk_overlap(self):
+        content = 'x ' * 32600 + 'rgb(1,' + ' ' * 400 + '2,3)'
+        self.assert_same_as_whole_content(content)
+        self.assertEqual(analyzer.analyze_file(self.path), {'#010203': {'rgb(1,' + ' ' * 400 + '2,3)'}})
+
+    def test_colors_split_between_chunks(self):
+        rng = random.Random(0)
+        for chunk_size, overlap in ((50, 25), (64, 32), (200, 100), (1000, 256)):
+            with mock.patch.object(analyzer, 'READ_CHUNK_SIZE', chunk_size), \
+                    mock.patch.object(analyzer, 'CHUNK_OVERLAP', overlap):
+                for _ in range(300):
+                    content = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 400)))
+                    with self.subTest(chunk_size=chunk_size, overlap=overlap):
+                        self.assert_same_as_whole_content(content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import random
+import unittest
+from unittest import mock
+
+from css_colors_analyzer import analyzer
+
+# Pieces of CSS that colors and near-misses are built from
+FRAGMENTS = [
+    '#fff', '#FFF', '#a1b2c3', '#A1B2C3', '#abcd', '#12345', '#1234567', '#ggg', '#fff_', '#fffx',
+    'rgb(1,2,3)', 'rgb( 10 , 20 , 30 )', 'rgb(300,0,0)', 'rgb(1,2)', 'rgb(1,2,3', 'RGB(1,2,3)',
+    'rgba(1,2,3,0.5)', 'rgba(1,2,3,.5)', 'rgba(1,2,3,1.0)', 'rgba(1,2,3,0)', 'rgba(1,2,3,2)',
+    'hsl(120,50%,50%)', 'hsl( 0 , 0% , 100% )', 'hsl(120,50,50)', 'hsla(120,50%,50%,0.3)',
+    'red', 'Red', 'RED', 'blue', 'aliceblue', 'darkslategrey', 'redish', 'xred', 'red_', 'tan',
+    ' ', '  ', '\t', '\n', '\x1c', ';', ':', ',', '(', ')', '{', '}', '-', '_', '.', '%', '#',
+    'a', 'b', 'x', '0', '9', 'color', 'background',
+]
+
+
+@unittest.skipIf(analyzer.HYPERSCAN_DATABASE is None, 'Hyperscan is not installed')
+class HyperscanTest(unittest.TestCase):
+    def test_matches_same_colors_as_re(self):
+        rng = random.Random(0)
+        for _ in range(40000):
+            content = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12)))
+            data = content.encode('ascii')
+
+            expected = [(match.span(), match.lastgroup) for match in analyzer.COLOR_RE.finditer(content)]
+            found = [(match.span(), match.lastgroup) for match in analyzer._hyperscan_finditer(content, data)]
+            self.assertEqual(found, expected, content)
+
+            with mock.patch.object(analyzer, 'HYPERSCAN_DATABASE', None):
+                without_hyperscan = analyzer.extract_colors_from_content(content)
+            self.assertEqual(analyzer.extract_colors_from_content(content), without_hyperscan, content)
+
+
+if __name__ == '__main__':
+    unittest.main()